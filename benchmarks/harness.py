@@ -0,0 +1,84 @@
+import json
+import platform
+import statistics
+import time
+
+class Benchmark:
+    """A named measurement: `setup()` builds the inputs, `run(state)` is the timed part."""
+
+    def __init__(self, name, run, setup=None, repeat=5, number=1):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.repeat = repeat
+        self.number = number  # Calls per repeat; the result is the per-call time
+
+    def measure(self):
+        """Returns the median per-call time in seconds over `repeat` rounds."""
+        state = self.setup() if self.setup else None
+        self.run(state)  # Warm-up (imports, caches, TF graph tracing)
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            for _ in range(self.number):
+                self.run(state)
+            timings.append((time.perf_counter() - start) / self.number)
+        return statistics.median(timings)
+
+def run_benchmarks(benchmarks, logger):
+    """Runs every benchmark; ones that cannot import their dependencies or that raise are reported as skipped."""
+    results, skipped = {}, []
+    for bench in benchmarks:
+        try:
+            seconds = bench.measure()
+        except ImportError as e:
+            logger.warning(f"{bench.name}: skipped ({e})")
+            skipped.append(bench.name)
+            continue
+        except Exception as e:
+            logger.error(f"{bench.name}: failed ({e!r})")
+            skipped.append(bench.name)
+            continue
+        results[bench.name] = seconds
+        logger.info(f"{bench.name}: {seconds * 1000:.3f} ms")
+    return results, skipped
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_baseline(path, results):
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def missing_metrics(results, baseline, selected=None):
+    """Returns the baseline metrics that have no result in this run.
+
+    With `selected` (names of the benchmarks this run attempted), metrics that
+    were deliberately filtered out (--only/--quick) are not counted as missing.
+    """
+    return sorted(
+        name for name in baseline["results"]
+        if name not in results and (selected is None or name in selected)
+    )
+
+def compare(results, baseline, threshold):
+    """Returns `(name, baseline, current, ratio)` for every metric slower than baseline * (1 + threshold)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None or previous <= 0:
+            continue
+        ratio = current / previous
+        if ratio > 1 + threshold:
+            regressions.append((name, previous, current, ratio))
+    return regressions
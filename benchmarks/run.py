@@ -0,0 +1,205 @@
+"""Benchmarks for the hot paths, on synthetic data and without network access.
+
+    python -m benchmarks.run                     # compare against benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline   # record a new baseline on this machine
+    python -m benchmarks.run --quick --only candle
+
+Exits with status 1 when a metric is slower than its baseline by more than
+--threshold (relative), when a benchmark that has a baseline was skipped or
+failed (with --strict, also when it was filtered out by --only/--quick), or
+when there is no baseline file (unless --allow-missing-baseline is given).
+Baselines are machine specific: record them on the box the comparison will
+run on.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+import numpy as np
+
+from benchmarks.harness import Benchmark, run_benchmarks, load_baseline, save_baseline, compare, missing_metrics
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+START_EPOCH = 1678886400
+
+def synthetic_ticks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    quotes = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    return [{"msg_type": "tick", "tick": {"epoch": START_EPOCH + i, "quote": float(q), "symbol": "R_100"}}
+            for i, q in enumerate(quotes)]
+
+def synthetic_candles(n, seed=0, granularity=60):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.05, n))
+    return [{"epoch": START_EPOCH + i * granularity, "open": float(o), "close": float(c),
+             "high": float(max(o, c) + s), "low": float(min(o, c) - s)}
+            for i, (o, c, s) in enumerate(zip(open_, close, spread))]
+
+def filled_handler(n_candles):
+    from src.data_handler import DataHandler
+    handler = DataHandler()
+    for candle in synthetic_candles(n_candles):
+        handler.process_candle({"candles": [candle]})
+    return handler
+
+class StubClient:
+    """Stands in for DerivClient: answers buys instantly without a connection."""
+
+    async def buy_contract(self, symbol, contract_type, amount, duration, duration_unit="m"):
+        return {"buy": {"contract_id": 1, "buy_price": float(amount)}}
+
+    async def buy_best_contract(self, symbol, variants, amount, min_payout_ratio=0.0, timeout=2.0):
+        return await self.buy_contract(symbol, variants[0]["contract_type"], amount, variants[0]["duration"],
+                                       variants[0]["duration_unit"])
+
+class FixedNetwork:
+    """Returns a constant 'rise' probability so the cycle always reaches the buy."""
+
+    def predict(self, X):
+        return 0.7
+
+# --- cases -------------------------------------------------------------------
+
+def ingest_ticks(n):
+    def setup():
+        from src.data_handler import DataHandler
+        return synthetic_ticks(n), DataHandler
+    def run(state):
+        ticks, DataHandler = state
+        handler = DataHandler()
+        for tick in ticks:
+            handler.process_tick(tick)
+    return Benchmark(f"process_tick[{n}]", run, setup, repeat=3)
+
+def ingest_candles(n):
+    def setup():
+        from src.data_handler import DataHandler
+        return [{"candles": [c]} for c in synthetic_candles(n)], DataHandler
+    def run(state):
+        candles, DataHandler = state
+        handler = DataHandler()
+        for candle in candles:
+            handler.process_candle(candle)
+    return Benchmark(f"process_candle[{n}]", run, setup, repeat=3)
+
+def candle_dataframe(n):
+    return Benchmark(f"get_candle_dataframe[{n}]", lambda h: h.get_candle_dataframe(),
+                     lambda: filled_handler(n), repeat=3)
+
+def indicators(n):
+    def setup():
+        handler = filled_handler(n)
+        return handler, handler.get_candle_dataframe()
+    def run(state):
+        handler, df = state
+        handler.calculate_technical_indicators(df.copy())
+    return Benchmark(f"calculate_technical_indicators[{n}]", run, setup, repeat=3)
+
+def window_building(n, lookback=10):
+    def setup():
+        from src.neural_network import prepare_data
+        return prepare_data, np.random.default_rng(0).normal(size=n)
+    def run(state):
+        prepare_data, data = state
+        prepare_data(data, lookback)
+    return Benchmark(f"prepare_data[{n},lookback={lookback}]", run, setup, repeat=3)
+
+def predict_single():
+    def setup():
+        from src.neural_network import NeuralNetwork
+        return NeuralNetwork((1, 3)), np.random.rand(1, 1, 3).astype(np.float32)
+    def run(state):
+        nn, X = state
+        nn.predict(X)
+    return Benchmark("NeuralNetwork.predict[1]", run, setup, repeat=5, number=20)
+
+def predict_batched(batch):
+    def setup():
+        from src.neural_network import NeuralNetwork
+        return NeuralNetwork((1, 3)), np.random.rand(batch, 1, 3).astype(np.float32)
+    def run(state):
+        nn, X = state
+        nn.model.predict(X, verbose=0)
+    return Benchmark(f"NeuralNetwork.predict[{batch}]", run, setup, repeat=5, number=5)
+
+def trading_cycle(n_candles=500, network="keras"):
+    def setup():
+        from src.trading_logic import TradingLogic
+        if network == "keras":
+            from src.neural_network import NeuralNetwork
+            nn = NeuralNetwork((1, 3))
+        else:
+            nn = FixedNetwork()
+        config = {"symbol": "R_100", "contract_type": "rise_fall", "amount": "1", "duration": "1"}
+        logic = TradingLogic(StubClient(), filled_handler(n_candles), nn, config)
+        return logic, asyncio.new_event_loop()
+    def run(state):
+        logic, loop = state
+        loop.run_until_complete(logic.trading_cycle())
+    return Benchmark(f"trading_cycle[{n_candles},{network}]", run, setup, repeat=5, number=5)
+
+def all_benchmarks(quick=False):
+    sizes = [1_000, 100_000] if quick else [1_000, 100_000, 1_000_000]
+    benches = [ingest_ticks(100_000), ingest_candles(100_000)]
+    benches += [candle_dataframe(n) for n in sizes]
+    benches += [indicators(n) for n in sizes]
+    benches += [window_building(n) for n in (10_000, 100_000)]
+    benches += [predict_single(), predict_batched(256)]
+    benches += [trading_cycle(network="stub"), trading_cycle(network="keras")]
+    return benches
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmarks.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--quick", action="store_true", help="skip the 1M-row cases")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--strict", action="store_true",
+                        help="also fail for baseline metrics that --only/--quick left out of this run")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="exit 0 instead of failing when the baseline file does not exist")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger = logging.getLogger("benchmarks")
+    # The code under test logs at INFO on every call; keep that noise out of the results
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    benches = all_benchmarks(quick=args.quick)
+    if args.only:
+        benches = [b for b in benches if args.only in b.name]
+    results, skipped = run_benchmarks(benches, logger)
+
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline) or {"results": {}}
+        save_baseline(args.baseline, {**baseline["results"], **results})
+        logger.info(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        message = f"No baseline at {args.baseline}; run with --update-baseline first."
+        if args.allow_missing_baseline:
+            logger.warning(message)
+            return 0
+        logger.error(message)
+        return 1
+    regressions = compare(results, baseline, args.threshold)
+    for name, previous, current, ratio in regressions:
+        logger.error(f"REGRESSION {name}: {previous * 1000:.3f} ms -> {current * 1000:.3f} ms ({ratio:.2f}x)")
+    missing = missing_metrics(results, baseline, None if args.strict else {b.name for b in benches})
+    for name in missing:
+        logger.error(f"MISSING {name}: in the baseline but not measured in this run")
+    if regressions or missing:
+        return 1
+    logger.info(f"No regressions beyond {args.threshold:.0%} ({len(results)} metrics, {len(skipped)} skipped).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import logging
 import os
@@ -5,12 +6,37 @@ from dotenv import load_dotenv
 
 from src.api_client import DerivClient
 from src.data_handler import DataHandler
-from src.neural_network import NeuralNetwork
 from src.trading_logic import TradingLogic
 from src.cli import CLI
 from src.utils import setup_logger, load_env_vars
 
-async def main():
+def create_neural_network(env_vars, input_shape, logger):
+    """Creates the inference backend selected by ENSEMBLE_MODELS / INFERENCE_BACKEND."""
+    if env_vars.get("ensemble_models"):
+        if env_vars.get("inference_backend", "keras") != "keras":
+            # Ensembles run full Keras models; don't silently load them on a node configured for tflite
+            raise ValueError("ENSEMBLE_MODELS requires INFERENCE_BACKEND=keras")
+        from src.ensemble import EnsembleNetwork
+        return EnsembleNetwork(
+            [path.strip() for path in env_vars["ensemble_models"].split(",") if path.strip()],
+            method=env_vars.get("ensemble_method", "mean"),
+            logger=logger
+        )
+    backend = env_vars.get("inference_backend", "keras")
+    if backend == "tflite":
+        # Imported lazily so CPU-only nodes never load the full Keras runtime
+        from src.tflite_backend import TFLiteNeuralNetwork
+        return TFLiteNeuralNetwork(
+            input_shape,
+            quantization=env_vars.get("tflite_quantization", "none"),
+            logger=logger
+        )
+    if backend == "keras":
+        from src.neural_network import NeuralNetwork
+        return NeuralNetwork(input_shape, logger=logger)
+    raise ValueError(f"Invalid inference backend: {backend}")
+
+async def main(daemon=False, metrics_port=9108):
     """Main async function to orchestrate the application."""
     # Load environment variables
     load_dotenv()
@@ -44,13 +70,16 @@ async def main():
             logger.info("Authentication successful")
             
             # Initialize other components
-            data_handler = DataHandler()
+            data_handler = DataHandler(
+                tick_interval=float(env_vars["tick_interval"]) if env_vars.get("tick_interval") else None,
+                candle_granularity=api_client.get_granularity(env_vars["candle_interval"]) if env_vars.get("candle_interval") else None
+            )
             logger.info("Data handler initialized")
             
             # Neural Network setup - adjust input_shape according to your model
             input_shape = (1, 3)  
-            nn = NeuralNetwork(input_shape, logger=logger)
-            logger.info("Neural network initialized")
+            nn = create_neural_network(env_vars, input_shape, logger)
+            logger.info(f"Neural network initialized ({type(nn).__name__})")
             
             # Try to load pre-trained model
             if nn.load_model():
@@ -62,10 +91,16 @@ async def main():
             trading_logic = TradingLogic(api_client, data_handler, nn, env_vars)
             logger.info("Trading logic initialized")
             
-            # Start CLI interface
-            cli = CLI(api_client, trading_logic, data_handler, nn)
-            logger.info("Starting CLI interface...")
-            await cli.main_menu()
+            if daemon:
+                # Headless mode: ingestion + trading in the background, metrics on localhost
+                from src.daemon import Daemon
+                logger.info("Starting daemon mode...")
+                await Daemon(api_client, data_handler, trading_logic, env_vars, metrics_port=metrics_port).run()
+            else:
+                # Start CLI interface
+                cli = CLI(api_client, trading_logic, data_handler, nn)
+                logger.info("Starting CLI interface...")
+                await cli.main_menu()
             
         except Exception as e:
             logger.error(f"Error during component initialization: {str(e)}", exc_info=True)
@@ -89,9 +124,19 @@ async def main():
         logger.info("Application shutdown complete")
         print("Application has been terminated.")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Deriv neural network trader")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run headless (no interactive menu) until SIGINT/SIGTERM")
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("METRICS_PORT", "9108")),
+                        help="port of the localhost Prometheus metrics endpoint (daemon mode)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    load_dotenv()  # Before parsing, so defaults like METRICS_PORT can come from .env
+    args = parse_args()
     try:
-        asyncio.run(main())
+        asyncio.run(main(daemon=args.daemon, metrics_port=args.metrics_port))
     except KeyboardInterrupt:
         print("\nApplication interrupted by user")
     except Exception as e:
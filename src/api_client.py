@@ -53,6 +53,33 @@ class DerivClient:
           self.logger.error(f"Failed to subscribe to candles: {e}")
           return None
 
+    async def stream(self, request, on_message):
+        """Subscribes with `request` and calls `on_message` for every message the stream emits."""
+        try:
+            source = await self.api.subscribe(request)
+            source.subscribe(
+                on_next=on_message,
+                on_error=lambda e: self.logger.error(f"Stream error for {request}: {e}")
+            )
+            self.logger.info(f"Streaming {request}")
+            return source
+        except Exception as e:
+            self.logger.error(f"Failed to start stream {request}: {e}")
+            return None
+
+    async def get_ticks_history(self, symbol, start, end, granularity=None, count=5000):
+        """Fetches ticks (or candles when `granularity` is given) between two epochs, inclusive."""
+        request = {
+            "ticks_history": symbol,
+            "start": int(start),
+            "end": int(end),
+            "count": count,
+            "style": "candles" if granularity else "ticks"
+        }
+        if granularity:
+            request["granularity"] = granularity
+        return await self.api.ticks_history(request)
+
     def get_granularity(self, interval):
         """Converts interval string (e.g., '5m') to granularity in seconds."""
         value = int(interval[:-1])
@@ -67,30 +94,94 @@ class DerivClient:
         else:
             raise ValueError(f"Invalid interval unit: {unit}")
 
-    async def buy_contract(self, symbol, contract_type, amount, duration):
+    def build_proposal_request(self, symbol, contract_type, amount, duration, duration_unit="m", barrier=None):
+        """Builds a stake-based proposal request for one contract variant."""
+        request = {
+            "proposal": 1,
+            "amount": amount,
+            "basis": "stake",
+            "contract_type": contract_type.upper(), # Ensure uppercase
+            "currency": "USD",
+            "duration": int(duration), # Ensure integer
+            "duration_unit": duration_unit,
+            "symbol": symbol
+        }
+        if barrier is not None:
+            request["barrier"] = barrier
+        return request
+
+    async def buy_contract(self, symbol, contract_type, amount, duration, duration_unit="m"):
       """Buys a contract with the specified parameters."""
       try:
-          proposal = await self.api.proposal({
-              "amount": amount,
-              "basis": "stake",
-              "contract_type": contract_type.upper(), # Ensure uppercase
-              "currency": "USD",
-              "duration": int(duration), # Ensure integer
-              "duration_unit": "m",      # Assuming minutes
-              "symbol": symbol
-          })
-
-          buy = await self.api.buy({
-              "buy": proposal['proposal']['id'],
-              "price": proposal['proposal']['ask_price']
-          })
-
-          self.logger.info(f"Contract bought: {buy}")
-          return buy
+          proposal = await self.api.proposal(
+              self.build_proposal_request(symbol, contract_type, amount, duration, duration_unit)
+          )
+          return await self.buy_proposal(proposal['proposal'])
       except Exception as e:
           self.logger.error(f"Failed to buy contract: {e}")
           return None
 
+    async def buy_proposal(self, proposal):
+        """Buys a previously quoted proposal at its ask price."""
+        buy = await self.api.buy({
+            "buy": proposal['id'],
+            "price": proposal['ask_price']
+        })
+        self.logger.info(f"Contract bought: {buy}")
+        return buy
+
+    async def get_best_proposal(self, symbol, variants, amount, min_payout_ratio=0.0, timeout=2.0):
+        """Requests a proposal for every variant concurrently and returns the best quote.
+
+        `variants` is a list of dicts with `contract_type`, `duration` and optionally
+        `duration_unit` and `barrier`. Quotes that have not arrived within `timeout`
+        seconds are discarded. Returns `(proposal, variant)` for the highest
+        payout-to-stake ratio that reaches `min_payout_ratio`, or `(None, None)`.
+        """
+        tasks = [
+            asyncio.create_task(self.api.proposal(
+                self.build_proposal_request(symbol, amount=amount, **variant)
+            ))
+            for variant in variants
+        ]
+        if not tasks:
+            return None, None
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.logger.warning(f"{len(pending)}/{len(tasks)} proposals missed the {timeout}s deadline")
+
+        best, best_variant, best_ratio = None, None, None
+        for task, variant in zip(tasks, variants):
+            if task not in done:
+                continue
+            if task.exception() is not None:
+                self.logger.warning(f"Proposal failed for {variant}: {task.exception()}")
+                continue
+            proposal = task.result()['proposal']
+            ratio = float(proposal['payout']) / float(proposal['ask_price'])
+            self.logger.debug(f"Proposal {variant}: payout/stake = {ratio:.3f}")
+            if ratio >= min_payout_ratio and (best_ratio is None or ratio > best_ratio):
+                best, best_variant, best_ratio = proposal, variant, ratio
+
+        if best is None:
+            self.logger.info(f"No proposal reached the minimum payout ratio {min_payout_ratio}")
+        else:
+            self.logger.info(f"Best proposal: {best_variant} with payout/stake {best_ratio:.3f}")
+        return best, best_variant
+
+    async def buy_best_contract(self, symbol, variants, amount, min_payout_ratio=0.0, timeout=2.0):
+        """Fans out proposals for all variants and buys the best qualifying quote."""
+        try:
+            proposal, variant = await self.get_best_proposal(symbol, variants, amount, min_payout_ratio, timeout)
+            if proposal is None:
+                return None
+            return await self.buy_proposal(proposal)
+        except Exception as e:
+            self.logger.error(f"Failed to buy best contract: {e}")
+            return None
+
     async def get_balance(self):
         """Gets the account balance."""
         try:
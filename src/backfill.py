@@ -0,0 +1,110 @@
+import asyncio
+import logging
+
+class GapBackfiller:
+    """Fills the gaps detected by DataHandler with batched `ticks_history` requests.
+
+    Gaps reported within `coalesce_delay` of each other are fetched together
+    (late stream messages arriving meanwhile shrink or close them), and
+    neighbouring gaps are merged into one request as long as the combined range
+    fits in a single response. Fetched ticks/candles go back through the
+    DataHandler, so anything already stored is dropped as a duplicate.
+    """
+
+    MAX_COUNT = 5000  # Most ticks/candles ticks_history returns per request
+    MERGE_CHUNK = 1000  # Samples merged into the DataHandler per event-loop turn
+
+    def __init__(self, api_client, data_handler, symbol, coalesce_delay=1.0, max_concurrency=3):
+        self.api_client = api_client
+        self.data_handler = data_handler
+        self.symbol = symbol
+        self.coalesce_delay = coalesce_delay
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.pending = asyncio.Event()
+        self.logger = logging.getLogger(__name__)
+
+    def notify(self):
+        """Signals that new gaps may be waiting; cheap enough to call after every message."""
+        if self.data_handler.has_gaps():
+            self.pending.set()
+
+    def plan_requests(self, gaps, cadence):
+        """Turns merged gaps into (start, end) request ranges of at most MAX_COUNT samples each."""
+        max_span = self.MAX_COUNT * cadence
+        ranges = []
+        for start, end in gaps:
+            if ranges and end - ranges[-1][0] <= max_span:
+                # Close enough to the previous range: one request covers both
+                ranges[-1] = (ranges[-1][0], max(end, ranges[-1][1]))
+                continue
+            while end - start > max_span:
+                ranges.append((start, start + max_span))
+                start += max_span
+            ranges.append((start, end))
+        return ranges
+
+    async def fetch(self, kind, start, end):
+        """Fetches one range and feeds the result to the data handler. Returns the number of samples received."""
+        granularity = self.data_handler.candle_granularity if kind == "candles" else None
+        async with self.semaphore:
+            response = await self.api_client.get_ticks_history(
+                self.symbol, start, end, granularity=granularity, count=self.MAX_COUNT
+            )
+        if kind == "candles":
+            items = [(candle["epoch"], candle) for candle in response.get("candles", [])]
+        else:
+            history = response.get("history", {})
+            items = [(epoch, {"tick": {"epoch": epoch, "quote": quote, "symbol": self.symbol}})
+                     for epoch, quote in zip(history.get("times", []), history.get("prices", []))]
+        self.requeue_uncovered(kind, start, end, [epoch for epoch, _ in items])
+        # Merge in chunks, yielding in between, so a large range never blocks the event loop for long
+        for start_index in range(0, len(items), self.MERGE_CHUNK):
+            self.data_handler.merge(kind, items[start_index:start_index + self.MERGE_CHUNK])
+            await asyncio.sleep(0)
+        return len(items)
+
+    def requeue_uncovered(self, kind, start, end, epochs):
+        """Queues again the parts of (start, end) a response did not reach, e.g. when it hit MAX_COUNT.
+
+        Both ends of a gap are stored samples, so a complete response spans the
+        whole range; pieces shorter than the gap tolerance are not gaps.
+        """
+        cadence = self.data_handler.candle_granularity if kind == "candles" else self.data_handler.tick_interval
+        pieces = [(start, min(epochs)), (max(epochs), end)] if epochs else [(start, end)]
+        for piece in pieces:
+            if piece[1] - piece[0] > cadence * self.data_handler.gap_tolerance:
+                self.data_handler.gaps[kind].append(piece)
+
+    async def backfill(self):
+        """Fetches every pending gap concurrently. Failed ranges are queued again."""
+        jobs = []
+        for kind, cadence in (("ticks", self.data_handler.tick_interval),
+                              ("candles", self.data_handler.candle_granularity)):
+            gaps = self.data_handler.pop_gaps(kind)
+            if not gaps or not cadence:
+                continue
+            for start, end in self.plan_requests(gaps, cadence):
+                jobs.append((kind, start, end))
+        if not jobs:
+            return
+
+        self.logger.info(f"Backfilling {len(jobs)} range(s): {jobs}")
+        results = await asyncio.gather(*(self.fetch(*job) for job in jobs), return_exceptions=True)
+        for (kind, start, end), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Backfill of {kind} {start} -> {end} failed: {result}")
+                self.data_handler.gaps[kind].append((start, end))
+            else:
+                self.logger.info(f"Backfilled {kind} {start} -> {end}: {result} samples received")
+
+    async def run(self, retry_delay=5.0):
+        """Waits for gaps and backfills them until cancelled."""
+        while True:
+            await self.pending.wait()
+            await asyncio.sleep(self.coalesce_delay)  # Let a burst of gaps accumulate
+            self.pending.clear()
+            await self.backfill()
+            if self.data_handler.has_gaps():
+                # Something failed: try again later rather than hammering the API
+                await asyncio.sleep(retry_delay)
+                self.pending.set()
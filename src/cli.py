@@ -14,6 +14,12 @@ class CLI:
         self.neural_network = neural_network
         self.logger = logging.getLogger(__name__)
         self.is_running = True
+        self.trading_task = None
+        try:
+            from src.profiler import ProfilingSession
+        except ImportError:  # Running this module's demo from inside src/
+            from profiler import ProfilingSession
+        self.profiling = ProfilingSession()
 
     async def main_menu(self):
         """Displays the main menu and handles user input."""
@@ -29,6 +35,8 @@ class CLI:
                         Choice("train", name="Entrenar Red Neuronal"),
                         Choice("save", name="Guardar Red Neuronal"),
                         Choice("load", name="Cargar Red Neuronal"),
+                        Choice("cpu_profile", name="Iniciar/Detener Perfilado de CPU"),
+                        Choice("alloc_trace", name="Iniciar/Detener Rastreo de Memoria"),
                         Choice("exit", name="Salir"),
                     ],
                     default="exit",
@@ -57,6 +65,10 @@ class CLI:
                 await self.save_network()
             elif choice == "load":
                 await self.load_network()
+            elif choice == "cpu_profile":
+                await self.toggle_cpu_profile()
+            elif choice == "alloc_trace":
+                await self.toggle_allocation_trace()
             elif choice == "exit":
                 await self.exit_program()
         except Exception as e:
@@ -64,14 +76,21 @@ class CLI:
             print(Fore.RED + f"Error al ejecutar la opción: {e}" + Style.RESET_ALL)
 
     async def start_trading(self):
-        """Starts the trading logic."""
+        """Starts the trading logic in the background so the menu stays usable."""
+        if self.trading_task and not self.trading_task.done():
+            print(Fore.YELLOW + "El trading automático ya está en marcha." + Style.RESET_ALL)
+            return
         print(Fore.GREEN + "Iniciando trading automático..." + Style.RESET_ALL)
-        await self.trading_logic.start_trading()
+        self.trading_task = asyncio.create_task(self.trading_logic.start_trading())
 
     async def stop_trading(self):
         """Stops the trading logic."""
         print(Fore.YELLOW + "Deteniendo trading automático..." + Style.RESET_ALL)
         await self.trading_logic.stop_trading()
+        if self.trading_task:
+            # Let a cycle in progress finish so an order already sent is still logged
+            await self.trading_task
+            self.trading_task = None
 
     async def show_balance(self):
         """Displays the current account balance."""
@@ -125,12 +144,30 @@ class CLI:
         else:
             print(Fore.RED + "No se pudo cargar la red neuronal." + Style.RESET_ALL)
 
+    async def toggle_cpu_profile(self):
+        """Starts or stops the sampling CPU profiler."""
+        path = self.profiling.toggle_cpu()
+        if path:
+            print(Fore.BLUE + f"Perfil de CPU guardado en {path}" + Style.RESET_ALL)
+        else:
+            print(Fore.BLUE + "Perfilado de CPU iniciado." + Style.RESET_ALL)
+
+    async def toggle_allocation_trace(self):
+        """Starts or stops tracemalloc allocation tracking."""
+        # Writing the report walks every traced block; keep it off the event loop
+        path = await asyncio.to_thread(self.profiling.toggle_allocations)
+        if path:
+            print(Fore.BLUE + f"Reporte de memoria guardado en {path}" + Style.RESET_ALL)
+        else:
+            print(Fore.BLUE + "Rastreo de memoria iniciado." + Style.RESET_ALL)
+
     async def exit_program(self):
         """Exits the program gracefully."""
         print(Fore.CYAN + "Saliendo del programa..." + Style.RESET_ALL)
         self.is_running = False
         if self.trading_logic.is_trading:
-            await self.trading_logic.stop_trading()
+            await self.stop_trading()
+        self.profiling.stop_all()
         await self.api_client.close()  # Espera a que se cierre la conexión
         #asyncio.get_event_loop().stop() #NO USAR: Evita que el bucle se detenga abruptamente
 async def main():
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import signal
+import time
+
+from src.backfill import GapBackfiller
+from src.metrics import Metrics, MetricsServer
+from src.profiler import ProfilingSession
+
+class Daemon:
+    """Runs ingestion and trading as background tasks without the interactive CLI.
+
+    Stream messages are pushed onto a bounded queue by the API callbacks and
+    consumed by a single ingestion task that feeds the DataHandler. SIGINT and
+    SIGTERM trigger a graceful shutdown so the process can run under a supervisor;
+    SIGUSR1 toggles the CPU profiler and SIGUSR2 toggles allocation tracing.
+    """
+
+    def __init__(self, api_client, data_handler, trading_logic, config,
+                 metrics_port=9108, queue_size=10000, monitor_interval=1.0):
+        self.api_client = api_client
+        self.data_handler = data_handler
+        self.trading_logic = trading_logic
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.metrics = Metrics()
+        self.metrics_server = MetricsServer(self.metrics, port=metrics_port)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.monitor_interval = monitor_interval
+        self.stop_event = None
+        self.tasks = []
+        self.profiler_tasks = set()  # The loop only keeps weak references to tasks
+        self.trading_logic.metrics = self.metrics
+        if hasattr(trading_logic.neural_network, "metrics"):
+            trading_logic.neural_network.metrics = self.metrics  # Ensemble agreement/latency
+        self.backfiller = GapBackfiller(api_client, data_handler, config["symbol"])
+        self.profiling = ProfilingSession()
+
+    def enqueue(self, message):
+        """Stream callback: queues a message, dropping it if ingestion has fallen too far behind."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.metrics.inc("deriv_messages_dropped_total")
+
+    async def ingest(self):
+        """Consumes stream messages and hands them to the data handler."""
+        while True:
+            message = await self.queue.get()
+            try:
+                msg_type = message.get("msg_type")
+                if msg_type == "tick":
+                    self.data_handler.process_tick(message)
+                    self.metrics.inc("deriv_ticks_total")
+                elif msg_type == "candles":
+                    for candle in message.get("candles", []):
+                        self.data_handler.process_candle({"candles": [candle]})
+                        self.metrics.inc("deriv_candles_total")
+                elif msg_type == "ohlc":
+                    ohlc = message["ohlc"]
+                    # Live updates of the open candle: key them by the candle's open time
+                    self.data_handler.process_candle({"candles": [{
+                        "epoch": int(ohlc["open_time"]),
+                        "open": float(ohlc["open"]),
+                        "high": float(ohlc["high"]),
+                        "low": float(ohlc["low"]),
+                        "close": float(ohlc["close"]),
+                    }]})
+                    self.metrics.inc("deriv_candles_total")
+                self.backfiller.notify()
+            except Exception as e:
+                self.logger.error(f"Error ingesting message: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def monitor(self):
+        """Samples event-loop lag, tick rate and buffer sizes once per interval."""
+        last_ticks = 0
+        expected = time.perf_counter() + self.monitor_interval
+        while True:
+            await asyncio.sleep(self.monitor_interval)
+            now = time.perf_counter()
+            self.metrics.set("deriv_event_loop_lag_seconds", max(0.0, now - expected))
+            ticks = self.metrics.counters.get("deriv_ticks_total", 0)
+            self.metrics.set("deriv_tick_rate", (ticks - last_ticks) / self.monitor_interval)
+            last_ticks = ticks
+            self.metrics.set("deriv_ingest_queue_depth", self.queue.qsize())
+            self.metrics.set("deriv_tick_buffer_size", len(self.data_handler.tick_data))
+            self.metrics.set("deriv_candle_buffer_size", len(self.data_handler.candle_data))
+            for stat, value in self.data_handler.stats.items():
+                # DataHandler keeps running totals; forward the increase since the last sample
+                name = f"deriv_ingest_{stat}_total"
+                self.metrics.inc(name, value - self.metrics.counters.get(name, 0))
+            expected = now + self.monitor_interval
+
+    async def subscribe(self):
+        """Starts the tick and candle streams."""
+        symbol = self.config["symbol"]
+        await self.api_client.stream({"ticks": symbol, "subscribe": 1}, self.enqueue)
+        await self.api_client.stream({
+            "ticks_history": symbol,
+            "style": "candles",
+            "granularity": self.api_client.get_granularity(self.config["candle_interval"]),
+            "end": "latest",
+            "count": 100,  # Enough history for the indicators on the first cycle
+            "subscribe": 1
+        }, self.enqueue)
+
+    def request_stop(self, reason):
+        if not self.stop_event.is_set():
+            self.logger.info(f"Stopping daemon: {reason}")
+            self.stop_event.set()
+
+    def toggle_profiler(self, toggle, label):
+        """Signal handler: flips a profiler, writing its report off the event loop."""
+        async def run():
+            path = await asyncio.to_thread(toggle)
+            self.logger.info(f"{label} report written to {path}" if path else f"{label} started")
+        task = asyncio.ensure_future(run())
+        self.profiler_tasks.add(task)
+        task.add_done_callback(self.profiler_tasks.discard)
+
+    def _on_task_done(self, task):
+        # A background task ending on its own means the daemon can no longer do its job
+        if not task.cancelled():
+            self.request_stop(f"task {task.get_name()} exited")
+
+    async def run(self):
+        """Runs until SIGINT/SIGTERM or until a background task exits."""
+        loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.request_stop, sig.name)
+        loop.add_signal_handler(signal.SIGUSR1, self.toggle_profiler, self.profiling.toggle_cpu, "CPU profile")
+        loop.add_signal_handler(signal.SIGUSR2, self.toggle_profiler, self.profiling.toggle_allocations, "Allocation")
+
+        await self.metrics_server.start()
+        try:
+            for name, coro in (("ingest", self.ingest()), ("monitor", self.monitor()),
+                               ("backfill", self.backfiller.run())):
+                self.tasks.append(asyncio.create_task(coro, name=name))
+            await self.subscribe()
+            self.tasks.append(asyncio.create_task(self.trading_logic.start_trading(), name="trading"))
+            for task in self.tasks:
+                task.add_done_callback(self._on_task_done)
+            self.logger.info("Daemon running.")
+            await self.stop_event.wait()
+        finally:
+            await self.shutdown()
+            for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGUSR1, signal.SIGUSR2):
+                loop.remove_signal_handler(sig)
+
+    async def shutdown(self):
+        """Stops trading, forgets subscriptions and cancels background tasks."""
+        if self.trading_logic.is_trading:
+            await self.trading_logic.stop_trading()
+        trading = [task for task in self.tasks if task.get_name() == "trading" and not task.done()]
+        if trading:
+            # Let a cycle in progress finish so an order already sent is still logged
+            await asyncio.wait(trading, timeout=30)
+        await self.api_client.forget_all(["ticks", "candles"])
+        for task in self.tasks:
+            task.remove_done_callback(self._on_task_done)
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        await self.metrics_server.stop()
+        await asyncio.to_thread(self.profiling.stop_all)  # Flush any profile still running
+        self.logger.info("Daemon stopped.")
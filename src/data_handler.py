@@ -1,17 +1,114 @@
+import bisect
+import heapq
 import logging
 import pandas as pd
 
 class DataHandler:
-    def __init__(self):
+    def __init__(self, tick_interval=None, candle_granularity=None, gap_tolerance=1.5):
         self.logger = logging.getLogger(__name__)
         self.tick_data = []
         self.candle_data = []
+        # Epoch indexes kept parallel to the data lists (sorted) plus sets for O(1) duplicate checks
+        self.tick_epochs = []
+        self.candle_epochs = []
+        self._tick_epoch_set = set()
+        self._candle_epoch_set = set()
+        # Expected cadence in seconds; None disables gap detection for that stream
+        self.tick_interval = tick_interval
+        self.candle_granularity = candle_granularity
+        self.gap_tolerance = gap_tolerance
+        self.gaps = {"ticks": [], "candles": []}  # Pending (last_epoch, next_epoch) ranges with missing data
+        self.stats = {"duplicates": 0, "late": 0, "gaps": 0, "backfilled": 0}
+
+    def _stream(self, kind):
+        if kind == "ticks":
+            return self.tick_data, self.tick_epochs, self._tick_epoch_set
+        return self.candle_data, self.candle_epochs, self._candle_epoch_set
+
+    def _store(self, kind, records, epochs, epoch_set, record, epoch):
+        """Stores `record` in epoch order. Returns False if it was dropped as a duplicate."""
+        if epoch in epoch_set:
+            if kind == "candles" and epoch == epochs[-1]:
+                # Live update of the still-open candle: the latest values win
+                records[-1] = record
+                return True
+            self.stats["duplicates"] += 1
+            return False
+
+        epoch_set.add(epoch)
+        if not epochs or epoch > epochs[-1]:
+            cadence = self.tick_interval if kind == "ticks" else self.candle_granularity
+            if epochs and cadence and epoch - epochs[-1] > cadence * self.gap_tolerance:
+                self.gaps[kind].append((epochs[-1], epoch))
+                self.stats["gaps"] += 1
+                self.logger.warning(f"Gap in {kind}: {epochs[-1]} -> {epoch} ({epoch - epochs[-1]}s)")
+            epochs.append(epoch)
+            records.append(record)
+        else:
+            # Late arrival: insert in order (backfill goes through merge() instead)
+            index = bisect.bisect_left(epochs, epoch)
+            epochs.insert(index, epoch)
+            records.insert(index, record)
+            self.stats["late"] += 1
+            if self.gaps[kind]:
+                self._trim_gaps(kind, epoch)  # The late sample may close (part of) a pending gap
+        return True
+
+    def merge(self, kind, items):
+        """Merges a batch of (epoch, record) pairs, e.g. a backfilled range, with a single splice.
+
+        Duplicates are dropped; the stored samples inside the batch's epoch range
+        are merged with the new ones once, instead of one list.insert per sample.
+        Returns the number of samples stored.
+        """
+        records, epochs, epoch_set = self._stream(kind)
+        new = {}
+        for epoch, record in items:
+            epoch = int(epoch)
+            if epoch in epoch_set or epoch in new:
+                self.stats["duplicates"] += 1
+                continue
+            new[epoch] = record
+        if not new:
+            return 0
+
+        new_epochs = sorted(new)
+        new_records = [new[epoch] for epoch in new_epochs]
+        epoch_set.update(new_epochs)
+        lo = bisect.bisect_left(epochs, new_epochs[0])
+        hi = bisect.bisect_right(epochs, new_epochs[-1])
+        if lo == hi:
+            epochs[lo:lo] = new_epochs
+            records[lo:lo] = new_records
+        else:
+            merged = list(heapq.merge(zip(epochs[lo:hi], records[lo:hi]), zip(new_epochs, new_records),
+                                      key=lambda pair: pair[0]))
+            epochs[lo:hi] = [epoch for epoch, _ in merged]
+            records[lo:hi] = [record for _, record in merged]
+        self.stats["backfilled"] += len(new_epochs)
+        if self.gaps[kind]:
+            for epoch in new_epochs:
+                self._trim_gaps(kind, epoch)
+        return len(new_epochs)
+
+    def _trim_gaps(self, kind, epoch):
+        """Splits any pending gap that `epoch` falls in, dropping the pieces that are no longer gaps."""
+        cadence = self.tick_interval if kind == "ticks" else self.candle_granularity
+        trimmed = []
+        for start, end in self.gaps[kind]:
+            if start < epoch < end:
+                trimmed.extend(piece for piece in ((start, epoch), (epoch, end))
+                               if piece[1] - piece[0] > cadence * self.gap_tolerance)
+            else:
+                trimmed.append((start, end))
+        self.gaps[kind] = trimmed
 
     def process_tick(self, tick):
         """Processes and stores tick data."""
         try:
-            self.tick_data.append(tick)
-            self.logger.debug(f"Processed tick: {tick['tick']['epoch']}, {tick['tick']['quote']}")
+            epoch = int(tick['tick']['epoch'])
+            if self._store("ticks", self.tick_data, self.tick_epochs, self._tick_epoch_set, tick, epoch):
+                self.logger.debug(f"Processed tick: {tick['tick']['epoch']}, {tick['tick']['quote']}")
         except Exception as e:
             self.logger.error(f"Error processing tick: {e}")
 
@@ -19,11 +116,27 @@ class DataHandler:
         """Processes and stores candle data."""
         try:
           candle_info = candle['candles'][0]
-          self.candle_data.append(candle_info)
-          self.logger.debug(f"Processed candle: {candle_info['epoch']}, Open: {candle_info['open']}, Close: {candle_info['close']}")
+          epoch = int(candle_info['epoch'])
+          if self._store("candles", self.candle_data, self.candle_epochs, self._candle_epoch_set, candle_info, epoch):
+              self.logger.debug(f"Processed candle: {candle_info['epoch']}, Open: {candle_info['open']}, Close: {candle_info['close']}")
         except Exception as e:
             self.logger.error(f"Error processing candle: {e}")
 
+    def has_gaps(self):
+        """Returns True if any stream has gaps waiting to be backfilled."""
+        return bool(self.gaps["ticks"] or self.gaps["candles"])
+
+    def pop_gaps(self, kind):
+        """Returns the pending gaps of `kind` ('ticks' or 'candles') merged where they overlap, and clears them."""
+        gaps, self.gaps[kind] = sorted(self.gaps[kind]), []
+        merged = []
+        for start, end in gaps:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+            else:
+                merged.append((start, end))
+        return merged
+
     def get_tick_dataframe(self):
         """Returns tick data as a Pandas DataFrame."""
         if not self.tick_data:
@@ -0,0 +1,171 @@
+import logging
+import time
+import numpy as np
+import tensorflow as tf
+
+class EnsembleNetwork:
+    """Runs several saved Keras models on the same feature window and combines their outputs.
+
+    Models that share an input shape are fused into a single tf.function graph
+    (shared input, concatenated outputs), so each group costs one call. Models
+    with longer lookbacks get the last `lookback` rows of the window they are
+    given. Exposes the same `predict`/`load_model` interface as NeuralNetwork.
+    """
+
+    METHODS = ("mean", "vote")
+
+    def __init__(self, model_paths, method="mean", threshold=0.5, profile_every=100, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        if method not in self.METHODS:
+            raise ValueError(f"Invalid ensemble method: {method}")
+        self.model_paths = list(model_paths)
+        self.method = method
+        self.threshold = threshold  # Decision boundary used for votes and agreement
+        self.profile_every = profile_every  # Time each member on its own after every N calls (0 disables)
+        self.models = []
+        self.groups = []  # (lookback, member indexes, fused model)
+        self.lookback = 1
+        self.metrics = None  # Optional src.metrics.Metrics, set by the daemon
+        self.calls = 0
+        self.stats = {}
+        self.last_probabilities = None
+        self.pending_profile = None
+
+    def load_model(self):
+        """Loads every member and builds one fused model per input shape."""
+        try:
+            self.models = [tf.keras.models.load_model(path) for path in self.model_paths]
+            by_shape = {}
+            for index, model in enumerate(self.models):
+                by_shape.setdefault(tuple(model.input_shape[1:]), []).append(index)
+
+            self.groups = [(shape[0], members, self.fuse([self.models[i] for i in members]))
+                           for shape, members in by_shape.items()]
+            self.lookback = max(lookback for lookback, _, _ in self.groups)
+            self.stats = {path: {"calls": 0, "agreements": 0, "latency_sum": 0.0, "solo_latency": None}
+                          for path in self.model_paths}
+            self.logger.info(
+                f"Ensemble of {len(self.models)} models loaded in {len(self.groups)} fused group(s), "
+                f"lookback {self.lookback}"
+            )
+        except Exception as e:
+            self.logger.error(f"Error loading ensemble: {e}")
+            return False
+        return True
+
+    def fuse(self, models):
+        """Compiles the members into one graph that returns their outputs side by side."""
+        @tf.function(reduce_retracing=True)
+        def fused(X):
+            return tf.concat([model(X, training=False) for model in models], axis=1)
+        return fused
+
+    def predict_members(self, X):
+        """Returns the 'rise' probability of every member for the single window X (1, lookback, features)."""
+        X = np.asarray(X, dtype=np.float32)
+        probabilities = np.empty(len(self.models), dtype=np.float32)
+        for lookback, members, fused in self.groups:
+            start = time.perf_counter()
+            output = fused(X[:, -lookback:, :]).numpy()[0]
+            elapsed = time.perf_counter() - start
+            probabilities[members] = output
+            for i in members:
+                self.stats[self.model_paths[i]]["latency_sum"] += elapsed  # Members of a group share one pass
+        return probabilities
+
+    def combine(self, probabilities):
+        if self.method == "vote":
+            return float(np.mean(probabilities > self.threshold))  # Share of models voting 'rise'
+        return float(np.mean(probabilities))
+
+    def predict(self, X):
+        """Predicts the probability of 'rise' (1) for the given input."""
+        try:
+            if not self.groups:
+                raise RuntimeError("Ensemble not loaded")
+            start = time.perf_counter()
+            probabilities = self.predict_members(X)
+            prediction = self.combine(probabilities)
+            self.record(probabilities, prediction, time.perf_counter() - start)
+            if self.profile_every and self.calls % self.profile_every == 0:
+                self.pending_profile = X  # Run later by run_pending_profile, outside the timed path
+            self.logger.debug(f"Prediction: {prediction} from {probabilities}")
+            return prediction
+        except Exception as e:
+            self.logger.error(f"Error during prediction: {e}")
+            return None
+
+    def record(self, probabilities, prediction, elapsed):
+        """Updates per-model agreement with the combined decision."""
+        self.calls += 1
+        self.last_probabilities = probabilities
+        decision = prediction > self.threshold
+        agree = (probabilities > self.threshold) == decision
+        for path, agreed in zip(self.model_paths, agree):
+            self.stats[path]["calls"] += 1
+            self.stats[path]["agreements"] += int(agreed)
+        if self.metrics is not None:
+            self.metrics.observe("deriv_ensemble_latency_seconds", elapsed)
+            self.metrics.set("deriv_ensemble_agreement", float(np.mean(agree)))
+            self.metrics.set("deriv_ensemble_spread", float(np.std(probabilities)))
+
+    def run_pending_profile(self):
+        """Times the members on their own if predict() asked for it; called after the trading cycle."""
+        if self.pending_profile is not None:
+            X, self.pending_profile = self.pending_profile, None
+            self.profile_members(X)
+
+    def profile_members(self, X):
+        """Times each member on its own, since fused groups only give one latency per group."""
+        X = np.asarray(X, dtype=np.float32)
+        for path, model in zip(self.model_paths, self.models):
+            lookback = model.input_shape[1]
+            start = time.perf_counter()
+            model(X[:, -lookback:, :], training=False)
+            self.stats[path]["solo_latency"] = time.perf_counter() - start
+        self.logger.info(f"Ensemble stats: {self.summary()}")
+
+    def summary(self):
+        """Per-model call count, agreement rate with the ensemble and latencies (ms)."""
+        return {
+            path: {
+                "calls": s["calls"],
+                "agreement": s["agreements"] / s["calls"] if s["calls"] else None,
+                "fused_latency_ms": 1000 * s["latency_sum"] / s["calls"] if s["calls"] else None,
+                "solo_latency_ms": 1000 * s["solo_latency"] if s["solo_latency"] is not None else None,
+            }
+            for path, s in self.stats.items()
+        }
+
+    def train(self, X_train, y_train, epochs=10, batch_size=32):
+        """Members are trained individually with NeuralNetwork."""
+        self.logger.error("Training is not supported for ensembles; train each member with NeuralNetwork.")
+
+    def save_model(self):
+        """Members are saved individually with NeuralNetwork."""
+        self.logger.warning(f"Ensemble members are read-only: {self.model_paths}")
+
+if __name__ == '__main__':
+    # Example Usage: compare one model against a five-model ensemble
+    from utils import setup_logger
+    from neural_network import NeuralNetwork
+    logger = setup_logger('ensemble_test', 'logs/ensemble_test.log')
+
+    paths = []
+    for seed in range(5):
+        tf.keras.utils.set_random_seed(seed)
+        nn = NeuralNetwork((1, 3), logger=logger)
+        nn.model_path = f"models/ensemble_{seed}.h5"
+        nn.save_model()
+        paths.append(nn.model_path)
+
+    X = np.random.rand(1, 1, 3).astype(np.float32)
+    for members in (paths[:1], paths):
+        ensemble = EnsembleNetwork(members, logger=logger, profile_every=0)
+        ensemble.load_model()
+        ensemble.predict(X)  # Warm-up
+        start = time.perf_counter()
+        for _ in range(100):
+            ensemble.predict(X)
+        logger.info(f"{len(members)} model(s): {(time.perf_counter() - start) * 10:.2f} ms per prediction")
+    ensemble.profile_members(X)
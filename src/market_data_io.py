@@ -0,0 +1,175 @@
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+TICK_SCHEMA = pa.schema([
+    ("epoch", pa.int64()),
+    ("quote", pa.float64()),
+    ("symbol", pa.string()),
+])
+CANDLE_SCHEMA = pa.schema([
+    ("epoch", pa.int64()),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+])
+FEATURE_SCHEMA = pa.schema(list(CANDLE_SCHEMA) + [
+    ("SMA_20", pa.float64()),
+    ("RSI", pa.float64()),
+])
+FEATURE_WARMUP = 20  # Rows of history the rolling indicators need (SMA_20 is the longest window)
+BATCH_SIZE = 65536
+
+def _is_parquet(path):
+    return str(path).endswith((".parquet", ".pq"))
+
+class _BatchWriter:
+    """Writes record batches to Arrow IPC (.arrow/.feather/.ipc) or Parquet, picked by extension."""
+
+    def __init__(self, path, schema):
+        self.path = path
+        if _is_parquet(path):
+            self.writer = pq.ParquetWriter(path, schema)
+        else:
+            self.sink = pa.OSFile(path, "wb")
+            self.writer = pa.ipc.new_file(self.sink, schema)
+        self.rows = 0
+
+    def write(self, batch):
+        self.writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self):
+        self.writer.close()
+        if not _is_parquet(self.path):
+            self.sink.close()
+
+def export_ticks(data_handler, path, batch_size=BATCH_SIZE):
+    """Streams the collected ticks to `path` one record batch at a time. Returns the row count."""
+    writer = _BatchWriter(path, TICK_SCHEMA)
+    try:
+        for start in range(0, len(data_handler.tick_data), batch_size):
+            chunk = [record["tick"] for record in data_handler.tick_data[start:start + batch_size]]
+            writer.write(pa.record_batch([
+                pa.array(data_handler.tick_epochs[start:start + batch_size], pa.int64()),
+                pa.array([tick["quote"] for tick in chunk], pa.float64()),
+                pa.array([tick.get("symbol") for tick in chunk], pa.string()),
+            ], schema=TICK_SCHEMA))
+    finally:
+        writer.close()
+    logger.info(f"Exported {writer.rows} ticks to {path}")
+    return writer.rows
+
+def export_candles(data_handler, path, batch_size=BATCH_SIZE):
+    """Streams the collected candles to `path` one record batch at a time. Returns the row count."""
+    writer = _BatchWriter(path, CANDLE_SCHEMA)
+    try:
+        for start in range(0, len(data_handler.candle_data), batch_size):
+            chunk = data_handler.candle_data[start:start + batch_size]
+            writer.write(pa.record_batch(
+                [pa.array(data_handler.candle_epochs[start:start + batch_size], pa.int64())]
+                + [pa.array([float(c[field]) for c in chunk], pa.float64()) for field in ("open", "high", "low", "close")],
+                schema=CANDLE_SCHEMA
+            ))
+    finally:
+        writer.close()
+    logger.info(f"Exported {writer.rows} candles to {path}")
+    return writer.rows
+
+def export_features(data_handler, path, batch_size=BATCH_SIZE):
+    """Streams candles plus their technical indicators to `path`.
+
+    Indicators are computed chunk by chunk with FEATURE_WARMUP rows of overlap,
+    which gives the same values as computing them over the whole history while
+    only one chunk is ever held as a DataFrame.
+    """
+    writer = _BatchWriter(path, FEATURE_SCHEMA)
+    try:
+        for start in range(0, len(data_handler.candle_data), batch_size):
+            warmup = min(start, FEATURE_WARMUP)
+            df = pd.DataFrame(data_handler.candle_data[start - warmup:start + batch_size])
+            df = data_handler.calculate_technical_indicators(df)
+            df = df.iloc[warmup:]
+            df["epoch"] = df["epoch"].astype("int64")
+            writer.write(pa.RecordBatch.from_pandas(
+                df[FEATURE_SCHEMA.names], schema=FEATURE_SCHEMA, preserve_index=False
+            ))
+    finally:
+        writer.close()
+    logger.info(f"Exported {writer.rows} feature rows to {path}")
+    return writer.rows
+
+def read_table(path, columns=None):
+    """Opens an exported file as a pyarrow Table backed by a memory map (no copy for Arrow IPC)."""
+    if _is_parquet(path):
+        return pq.read_table(path, columns=columns, memory_map=True)
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    return table.select(columns) if columns else table
+
+def iter_batches(path, batch_size=BATCH_SIZE, columns=None):
+    """Yields the record batches of an exported file without loading the whole file."""
+    if _is_parquet(path):
+        yield from pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size, columns=columns)
+        return
+    reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        yield batch.select(columns) if columns else batch
+
+def read_feature_array(path, columns=("close", "SMA_20", "RSI")):
+    """Returns the given feature columns as a (rows, features) float array, ready for prepare_data."""
+    table = read_table(path, columns=list(columns))
+    return np.column_stack([table.column(name).to_numpy() for name in columns])
+
+def import_ticks(data_handler, path, batch_size=BATCH_SIZE):
+    """Feeds exported ticks back through the data handler (duplicates are dropped). Returns the row count."""
+    rows = 0
+    for batch in iter_batches(path, batch_size):
+        for epoch, quote, symbol in zip(*(batch.column(name).to_pylist() for name in TICK_SCHEMA.names)):
+            data_handler.process_tick({"tick": {"epoch": epoch, "quote": quote, "symbol": symbol}})
+        rows += batch.num_rows
+    logger.info(f"Imported {rows} ticks from {path}")
+    return rows
+
+def import_candles(data_handler, path, batch_size=BATCH_SIZE):
+    """Feeds exported candles (or feature rows) back through the data handler. Returns the row count."""
+    rows = 0
+    for batch in iter_batches(path, batch_size, columns=CANDLE_SCHEMA.names):
+        for candle in batch.to_pylist():
+            data_handler.process_candle({"candles": [candle]})
+        rows += batch.num_rows
+    logger.info(f"Imported {rows} candles from {path}")
+    return rows
+
+if __name__ == '__main__':
+    # Example Usage: round-trip synthetic candles through Parquet and Arrow IPC
+    import os
+    from utils import setup_logger
+    from data_handler import DataHandler
+    setup_logger('market_data_io_test', 'logs/market_data_io_test.log')
+
+    handler = DataHandler()
+    for i in range(200_000):
+        price = 100 + np.sin(i / 100)
+        handler.process_candle({'candles': [{'epoch': 1678886400 + i * 60, 'open': price, 'high': price + 0.1,
+                                             'low': price - 0.1, 'close': price + 0.05}]})
+
+    os.makedirs("data", exist_ok=True)
+    export_candles(handler, "data/candles.parquet")
+    export_features(handler, "data/features.arrow")
+
+    features = read_table("data/features.arrow")
+    print(features.schema)
+    print(features.slice(0, 25).to_pandas())
+
+    X = read_feature_array("data/features.arrow")
+    print(f"Feature array: {X.shape}")
+
+    restored = DataHandler()
+    import_candles(restored, "data/candles.parquet")
+    print(f"Restored {len(restored.candle_data)} candles")
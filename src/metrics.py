@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# HELP/TYPE lines for the metrics exported by the daemon
+DESCRIPTIONS = {
+    "deriv_ticks_total": ("counter", "Ticks received from the stream."),
+    "deriv_candles_total": ("counter", "Candle updates received from the stream."),
+    "deriv_messages_dropped_total": ("counter", "Stream messages dropped because the ingestion queue was full."),
+    "deriv_tick_rate": ("gauge", "Ticks per second over the last sampling interval."),
+    "deriv_ingest_queue_depth": ("gauge", "Messages waiting in the ingestion queue."),
+    "deriv_tick_buffer_size": ("gauge", "Ticks held by the data handler."),
+    "deriv_candle_buffer_size": ("gauge", "Candles held by the data handler."),
+    "deriv_ingest_duplicates_total": ("counter", "Samples dropped as duplicate epochs."),
+    "deriv_ingest_late_total": ("counter", "Out-of-order stream messages inserted in epoch order."),
+    "deriv_ingest_gaps_total": ("counter", "Gaps detected against the expected tick/candle cadence."),
+    "deriv_ingest_backfilled_total": ("counter", "Samples stored from ticks_history backfill."),
+    "deriv_event_loop_lag_seconds": ("gauge", "How late the event loop woke up the last monitor tick."),
+    "deriv_cycle_latency_seconds": ("summary", "Duration of a full trading cycle."),
+    "deriv_prediction_latency_seconds": ("summary", "Duration of a model prediction."),
+    "deriv_order_latency_seconds": ("summary", "Duration of a proposal + buy round trip."),
+    "deriv_ensemble_latency_seconds": ("summary", "Duration of a fused ensemble prediction."),
+    "deriv_ensemble_agreement": ("gauge", "Share of ensemble members agreeing with the combined decision."),
+    "deriv_ensemble_spread": ("gauge", "Standard deviation of the members' probabilities."),
+}
+
+class Metrics:
+    """In-process metric registry rendered in Prometheus text exposition format."""
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, window=1024):
+        self.counters = {}
+        self.gauges = {}
+        self.summaries = {}
+        self.window = window  # Recent samples kept per summary for the quantiles
+
+    def inc(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        self.gauges[name] = value
+
+    def observe(self, name, value):
+        summary = self.summaries.get(name)
+        if summary is None:
+            summary = self.summaries[name] = {"sum": 0.0, "count": 0, "samples": deque(maxlen=self.window)}
+        summary["sum"] += value
+        summary["count"] += 1
+        summary["samples"].append(value)
+
+    @contextmanager
+    def time(self, name):
+        """Observes the wall-clock duration of the wrapped block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def render(self):
+        """Returns all metrics in Prometheus text format (version 0.0.4)."""
+        lines = []
+
+        def header(name, default_type):
+            metric_type, help_text = DESCRIPTIONS.get(name, (default_type, name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        for name, value in sorted(self.counters.items()):
+            header(name, "counter")
+            lines.append(f"{name} {value}")
+        for name, value in sorted(self.gauges.items()):
+            header(name, "gauge")
+            lines.append(f"{name} {value}")
+        for name, summary in sorted(self.summaries.items()):
+            header(name, "summary")
+            samples = sorted(summary["samples"])
+            for q in self.QUANTILES:
+                value = samples[min(int(q * len(samples)), len(samples) - 1)] if samples else float("nan")
+                lines.append(f'{name}{{quantile="{q}"}} {value}')
+            lines.append(f"{name}_sum {summary['sum']}")
+            lines.append(f"{name}_count {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+class MetricsServer:
+    """Minimal asyncio HTTP server exposing GET /metrics on localhost."""
+
+    def __init__(self, metrics, host="127.0.0.1", port=9108):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.server = None
+        self.logger = logging.getLogger(__name__)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_request, self.host, self.port)
+        self.logger.info(f"Metrics endpoint listening on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.logger.info("Metrics endpoint stopped.")
+
+    async def handle_request(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Drain headers; the body of a GET is ignored
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.metrics.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except Exception as e:
+            self.logger.debug(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+if __name__ == '__main__':
+    # Example Usage: serve some sample metrics for 30 seconds (curl localhost:9108/metrics)
+    async def demo():
+        metrics = Metrics()
+        metrics.inc("deriv_ticks_total", 42)
+        metrics.set("deriv_ingest_queue_depth", 3)
+        for i in range(100):
+            metrics.observe("deriv_cycle_latency_seconds", i / 1000)
+        print(metrics.render())
+        server = MetricsServer(metrics)
+        await server.start()
+        await asyncio.sleep(30)
+        await server.stop()
+
+    asyncio.run(demo())
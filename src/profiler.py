@@ -0,0 +1,172 @@
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+class SamplingProfiler:
+    """Low-overhead CPU profiler that samples the stacks of all threads from a background thread.
+
+    The cost is bounded by the sampling interval and `max_depth`, not by how much
+    code runs, so it can be switched on in production. Stacks are written in the
+    folded format understood by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval=0.01, max_depth=64, output_dir="logs"):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.output_dir = output_dir
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self.stacks.clear()
+        self.samples = 0
+        self.started_at = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        self.logger.info(f"CPU profiler started ({1 / self.interval:.0f} Hz).")
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        """Stops sampling and writes the folded stacks. Returns the output path."""
+        if not self.running:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.folded")
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.logger.info(
+            f"CPU profiler stopped after {time.time() - self.started_at:.1f}s, "
+            f"{self.samples} samples written to {path}"
+        )
+        return path
+
+class AllocationTracer:
+    """Wraps tracemalloc and writes the top-N allocation sites, plus growth since start."""
+
+    def __init__(self, nframes=10, top_n=25, output_dir="logs"):
+        self.nframes = nframes  # Deeper tracebacks cost more memory and time per allocation
+        self.top_n = top_n
+        self.output_dir = output_dir
+        self.baseline = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self):
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if self.running:
+            return
+        tracemalloc.start(self.nframes)
+        self.baseline = tracemalloc.take_snapshot()
+        self.logger.info(f"Allocation tracing started ({self.nframes} frames).")
+
+    IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+    def _top(self, stats):
+        """First top_n grouped stats not allocated by tracemalloc itself or the import machinery.
+
+        Filtering after grouping is much cheaper than Snapshot.filter_traces, which
+        walks every trace of a large heap.
+        """
+        kept = (stat for stat in stats if stat.traceback[-1].filename not in self.IGNORED_FILES)
+        return list(itertools.islice(kept, self.top_n))
+
+    def stop(self):
+        """Stops tracing and writes the report. Returns the output path."""
+        if not self.running:
+            return None
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"allocations_{time.strftime('%Y%m%d_%H%M%S')}.txt")
+        with open(path, "w") as f:
+            f.write(f"Traced memory: current {current / 1024 / 1024:.1f} MB, peak {peak / 1024 / 1024:.1f} MB\n")
+            f.write(f"\nTop {self.top_n} allocation sites:\n")
+            for stat in self._top(snapshot.statistics("traceback")):
+                f.write(f"\n{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                f.write("\n".join(stat.traceback.format(limit=self.nframes)) + "\n")
+            f.write(f"\nTop {self.top_n} growth since tracing started:\n")
+            for stat in self._top(snapshot.compare_to(self.baseline, "lineno")):
+                f.write(f"{stat}\n")
+        self.baseline = None
+        self.logger.info(f"Allocation tracing stopped; report written to {path}")
+        return path
+
+class ProfilingSession:
+    """Start/stop switches shared by the CLI menu and the daemon's signal handlers."""
+
+    def __init__(self, output_dir="logs"):
+        self.cpu = SamplingProfiler(output_dir=output_dir)
+        self.allocations = AllocationTracer(output_dir=output_dir)
+
+    def toggle_cpu(self):
+        """Starts the CPU profiler, or stops it and returns the path of the folded stacks."""
+        if self.cpu.running:
+            return self.cpu.stop()
+        self.cpu.start()
+        return None
+
+    def toggle_allocations(self):
+        """Starts allocation tracing, or stops it and returns the path of the report."""
+        if self.allocations.running:
+            return self.allocations.stop()
+        self.allocations.start()
+        return None
+
+    def stop_all(self):
+        return self.cpu.stop(), self.allocations.stop()
+
+if __name__ == '__main__':
+    # Example Usage: profile a small pandas workload
+    #   flamegraph.pl logs/profile_*.folded > profile.svg
+    import numpy as np
+    import pandas as pd
+    from utils import setup_logger
+    logger = setup_logger('profiler_test', 'logs/profiler_test.log')
+
+    session = ProfilingSession()
+    session.toggle_cpu()
+    session.toggle_allocations()
+    df = pd.DataFrame({"close": np.random.rand(1_000_000)})
+    for _ in range(5):
+        df["close"].rolling(window=20).mean()
+    cpu_path, alloc_path = session.stop_all()
+    logger.info(f"Folded stacks: {cpu_path}, allocations: {alloc_path}")
@@ -0,0 +1,242 @@
+import logging
+import os
+import resource
+import time
+import numpy as np
+
+class TFLiteNeuralNetwork:
+    """Serves predictions for the saved Keras model through the TFLite interpreter.
+
+    Drop-in replacement for NeuralNetwork on CPU-only nodes: the Keras model is
+    converted once (optionally quantized) and only the lightweight interpreter is
+    kept in memory afterwards. Conversion is a separate offline step (see
+    `convert`); serving only needs ai-edge-litert or tflite-runtime.
+    """
+
+    QUANTIZATION_MODES = ("none", "float16", "int8")
+
+    def __init__(self, input_shape, quantization="none", num_threads=None, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        if quantization not in self.QUANTIZATION_MODES:
+            raise ValueError(f"Invalid quantization mode: {quantization}")
+        self.input_shape = tuple(input_shape)
+        self.quantization = quantization
+        self.num_threads = num_threads
+        self.model_path = "models/my_model.h5"  # Same source model as NeuralNetwork
+        suffix = "" if quantization == "none" else f"_{quantization}"
+        self.tflite_path = f"models/my_model{suffix}.tflite"
+        self.interpreter = None
+        self._input_index = None
+        self._output_index = None
+        self._batch_size = None
+
+    def convert(self, keras_model=None):
+        """Converts the Keras model to TFLite and writes it next to the source model.
+
+        Raises instead of writing the file if the serving interpreter cannot run the result.
+        """
+        import tensorflow as tf
+
+        if keras_model is None:
+            keras_model = tf.keras.models.load_model(self.model_path)
+
+        # An unrolled LSTM lowers to builtin ops only; the looped one needs TensorFlow's Flex delegate
+        unrolled = tf.keras.models.clone_model(keras_model, clone_function=_unroll_layer)
+        unrolled.set_weights(keras_model.get_weights())
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(unrolled)
+        if self.quantization == "float16":
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif self.quantization == "int8":
+            # Dynamic-range quantization: int8 weights, float activations, no calibration set needed
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        tflite_model = converter.convert()
+
+        # Refuse to write a model the serving runtime cannot run
+        interpreter = _get_interpreter_class()(model_content=tflite_model)
+        interpreter.allocate_tensors()
+        details = interpreter.get_input_details()[0]
+        interpreter.set_tensor(details["index"], np.zeros(details["shape"], dtype=np.float32))
+        interpreter.invoke()
+
+        os.makedirs(os.path.dirname(self.tflite_path), exist_ok=True)
+        with open(self.tflite_path, "wb") as f:
+            f.write(tflite_model)
+        self.logger.info(f"Model converted to TFLite ({self.quantization}) at {self.tflite_path}")
+        return self.tflite_path
+
+    def is_stale(self):
+        """True if the .tflite file is missing or older than the Keras model it was converted from."""
+        return (
+            not os.path.exists(self.tflite_path)
+            or (os.path.exists(self.model_path)
+                and os.path.getmtime(self.model_path) > os.path.getmtime(self.tflite_path))
+        )
+
+    def load_model(self):
+        """Loads the converted TFLite model. Never converts: serving must not pull in TensorFlow."""
+        try:
+            if self.is_stale():
+                self.logger.error(
+                    f"{self.tflite_path} is missing or older than {self.model_path}; convert it first with "
+                    f"`python src/tflite_backend.py convert {self.quantization}`"
+                )
+                self.interpreter = None
+                return False
+
+            Interpreter = _get_interpreter_class()
+            self.interpreter = Interpreter(model_path=self.tflite_path, num_threads=self.num_threads)
+            self._input_index = self.interpreter.get_input_details()[0]["index"]
+            self._output_index = self.interpreter.get_output_details()[0]["index"]
+            self._batch_size = None
+            self._resize(1)
+            self.logger.info(f"TFLite model loaded from {self.tflite_path}")
+        except Exception as e:
+            self.logger.error(f"Error loading TFLite model: {e}")
+            self.interpreter = None
+            return False
+        return True
+
+    def _resize(self, batch_size):
+        """Resizes the input tensor to the given batch size (no-op if unchanged)."""
+        if batch_size == self._batch_size:
+            return
+        self.interpreter.resize_tensor_input(self._input_index, [batch_size, *self.input_shape])
+        self.interpreter.allocate_tensors()
+        self._batch_size = batch_size
+
+    def predict_batch(self, X):
+        """Returns the 'rise' probability for every sample in X as a 1-D array."""
+        X = np.asarray(X, dtype=np.float32)
+        self._resize(X.shape[0])
+        self.interpreter.set_tensor(self._input_index, X)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output_index)[:, 0].copy()
+
+    def predict(self, X):
+        """Predicts the probability of 'rise' (1) for the given input."""
+        try:
+            if self.interpreter is None:
+                raise RuntimeError("TFLite model not loaded")
+            prediction = self.predict_batch(X)
+            self.logger.debug(f"Prediction: {prediction[0]}")
+            return prediction[0]  # Return single probability
+        except Exception as e:
+            self.logger.error(f"Error during prediction: {e}")
+            return None
+
+    def train(self, X_train, y_train, epochs=10, batch_size=32):
+        """Training is not supported by the TFLite backend."""
+        self.logger.error("Training is not supported by the TFLite backend; train with the Keras backend and reload.")
+
+    def save_model(self):
+        """The TFLite model is written on conversion; there is nothing else to save."""
+        self.logger.warning(f"TFLite backend is read-only; model lives at {self.tflite_path}")
+
+def _unroll_layer(layer):
+    """clone_model hook: rebuilds recurrent layers with unroll=True (needs a fixed lookback)."""
+    config = layer.get_config()
+    if "unroll" in config:
+        config["unroll"] = True
+    return layer.__class__.from_config(config)
+
+def _get_interpreter_class():
+    """Prefers the standalone LiteRT / tflite_runtime packages (requirements-tflite.txt) over TensorFlow."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            logging.getLogger(__name__).warning(
+                "Neither ai-edge-litert nor tflite-runtime is installed; falling back to TensorFlow's interpreter, "
+                "which loads the full TensorFlow runtime. Install requirements-tflite.txt on serving nodes."
+            )
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+def measure_drift(reference, candidate, X, threshold=0.5):
+    """Compares the predictions of two backends on the same inputs.
+
+    Returns the absolute probability error and the share of samples whose
+    rise/fall decision (at `threshold`) is unchanged.
+    """
+    for network in (reference, candidate):
+        if not hasattr(network, "model") and network.interpreter is None:
+            raise RuntimeError("TFLite model not loaded")
+    X = np.asarray(X, dtype=np.float32)
+    ref = np.asarray(reference.model.predict(X, verbose=0)[:, 0]) if hasattr(reference, "model") else reference.predict_batch(X)
+    cand = np.asarray(candidate.model.predict(X, verbose=0)[:, 0]) if hasattr(candidate, "model") else candidate.predict_batch(X)
+    diff = np.abs(ref - cand)
+    return {
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "decision_agreement": float(np.mean((ref > threshold) == (cand > threshold))),
+    }
+
+def benchmark_predict(network, sample, runs=200, warmup=10):
+    """Measures single-row predict latency (ms) and the peak RSS of the current process (MB).
+
+    Peak RSS covers everything the process has done so far, so only compare it
+    between fresh processes that loaded nothing but the backend under test.
+    """
+    for _ in range(warmup):
+        network.predict(sample)
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        network.predict(sample)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies = np.array(latencies)
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "mean_ms": float(latencies.mean()),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # ru_maxrss is KB on Linux
+    }
+
+if __name__ == '__main__':
+    # Example Usage (run from the repo root, where models/ and logs/ live):
+    #   python src/tflite_backend.py convert none | float16 | int8     # one-off conversion, needs TensorFlow
+    #   python src/tflite_backend.py benchmark keras | none | float16 | int8
+    # Run each benchmark in its own process so peak RSS is not shared between backends.
+    import sys
+    import json
+    from utils import setup_logger
+    logger = setup_logger('tflite_backend_test', 'logs/tflite_backend_test.log')
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "benchmark"
+    backend = sys.argv[2] if len(sys.argv) > 2 else "none"
+    input_shape = (1, 3)
+
+    if command == "convert":
+        TFLiteNeuralNetwork(input_shape, quantization=backend, logger=logger).convert()
+        sys.exit(0)
+
+    X = np.random.rand(512, *input_shape).astype(np.float32)
+    sample = X[:1]
+    if backend == "keras":
+        from neural_network import NeuralNetwork
+        network = NeuralNetwork(input_shape, logger=logger)
+    else:
+        network = TFLiteNeuralNetwork(input_shape, quantization=backend, logger=logger)
+    if not network.load_model():
+        logger.warning("Please train and save (and for TFLite, convert) the model first")
+        sys.exit(1)
+
+    results = {"backend": backend, **benchmark_predict(network, sample)}
+    if backend != "keras" and "tensorflow" in sys.modules:
+        # The interpreter fell back to TensorFlow, so the RSS figure is not the lightweight runtime's
+        logger.warning("TensorFlow was imported in this process; peak RSS is not reported for the TFLite backend")
+        results["peak_rss_mb"] = None
+
+    if backend != "keras":
+        # Accuracy drift against the stock Keras model (loaded after the RSS reading above)
+        from neural_network import NeuralNetwork
+        reference = NeuralNetwork(input_shape, logger=logger)
+        if reference.load_model():
+            results["drift"] = measure_drift(reference, network, X)
+
+    print(json.dumps(results, indent=2))
@@ -1,5 +1,25 @@
 import logging
 import asyncio
+import time
+
+# Contract type to request for each (contract family, predicted direction)
+CONTRACT_TYPES = {
+    "rise_fall": {"rise": "rise", "fall": "fall"},
+    "up_down": {"rise": "up", "fall": "down"},
+    "higher_lower": {"rise": "call", "fall": "put"},  # Needs a barrier
+}
+
+def parse_durations(value):
+    """Parses a comma-separated list of positive integer durations, e.g. "1,3,5". Raises ValueError if malformed."""
+    if not value:
+        return []
+    try:
+        durations = [int(d) for d in value.split(",") if d.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid PROPOSAL_DURATIONS: {value!r} (expected e.g. 1,3,5)") from None
+    if not durations or any(d <= 0 for d in durations):
+        raise ValueError(f"Invalid PROPOSAL_DURATIONS: {value!r} (durations must be positive)")
+    return durations
 
 class TradingLogic:
     def __init__(self, api_client, data_handler, neural_network, config):
@@ -9,31 +29,98 @@ class TradingLogic:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.is_trading = False
+        self.stop_event = None  # Set by stop_trading to cut the wait between cycles short
+        self.metrics = None  # Optional src.metrics.Metrics, set by the daemon
+        self.proposal_durations = parse_durations(config.get("proposal_durations"))
+
+    def observe(self, name, start):
+        """Records the time elapsed since `start` (perf_counter) if metrics are enabled."""
+        if self.metrics is not None:
+            self.metrics.observe(name, time.perf_counter() - start)
 
     async def start_trading(self):
         """Starts the trading loop."""
         self.is_trading = True
+        self.stop_event = asyncio.Event()
         self.logger.info("Trading started.")
         while self.is_trading:
             try:
+                start = time.perf_counter()
                 await self.trading_cycle()
-                await asyncio.sleep(60)  # Check every minute (adjust as needed)
+                self.observe("deriv_cycle_latency_seconds", start)
+                await self.after_cycle()
+                try:
+                    # Check every minute (adjust as needed); wakes up early when trading is stopped
+                    await asyncio.wait_for(self.stop_event.wait(), timeout=60)
+                except asyncio.TimeoutError:
+                    pass
             except Exception as e:
                 self.logger.error(f"Error in trading loop: {e}")
                 break
 
+    async def after_cycle(self):
+        """Runs deferred work of the network (e.g. ensemble solo profiling) outside the timed cycle."""
+        run_pending_profile = getattr(self.neural_network, "run_pending_profile", None)
+        if run_pending_profile is not None:
+            await asyncio.to_thread(run_pending_profile)
+
     async def stop_trading(self):
-        """Stops the trading loop."""
+        """Stops the trading loop once the current cycle (and any order in flight) has finished."""
         self.is_trading = False
+        if self.stop_event is not None:
+            self.stop_event.set()
         self.logger.info("Trading stopped.")
 
+    def contract_type_for(self, trade_direction, contract_family):
+        """Maps a predicted direction to the contract type of the given family."""
+        return CONTRACT_TYPES.get(contract_family, {}).get(trade_direction)
+
+    def proposal_variants(self, trade_direction):
+        """Builds the contract variants to quote from PROPOSAL_DURATIONS / PROPOSAL_CONTRACT_TYPES."""
+        families = (self.config.get("proposal_contract_types") or self.config["contract_type"]).split(",")
+        variants = []
+        for family in (f.strip() for f in families):
+            contract_type = self.contract_type_for(trade_direction, family)
+            if contract_type is None:
+                self.logger.warning(f"Not Allowed Contract Type: {family}")
+                continue
+            barrier = None
+            if family == "higher_lower":
+                barrier = self.config.get("barrier")
+                if not barrier:
+                    self.logger.warning("higher_lower needs BARRIER to be set. Skipping it.")
+                    continue
+            for duration in self.proposal_durations:
+                variants.append({
+                    "contract_type": contract_type,
+                    "duration": duration,
+                    "duration_unit": self.config.get("duration_unit") or "m",
+                    "barrier": barrier,
+                })
+        return variants
+
+    async def buy_best_variant(self, trade_direction):
+        """Quotes every configured variant concurrently and buys the best payout-to-stake ratio."""
+        variants = self.proposal_variants(trade_direction)
+        if not variants:
+            self.logger.warning("No contract variants to quote.")
+            return None
+        return await self.api_client.buy_best_contract(
+            self.config["symbol"],
+            variants,
+            self.config["amount"],
+            min_payout_ratio=float(self.config.get("min_payout_ratio") or 0),
+            timeout=float(self.config.get("proposal_timeout") or 2)
+        )
+
     async def trading_cycle(self):
         """Executes one trading cycle: data analysis, prediction, and trade execution."""
         self.logger.info("Executing trading cycle...")
 
         # 1. Prepare Data:  Get candle data and calculate indicators
+        lookback = getattr(self.neural_network, "lookback", 1)  # Rows the model(s) need, 1 for a single-step model
         candle_df = self.data_handler.get_candle_dataframe()
-        if candle_df.empty or len(candle_df) < 20:
+        if candle_df.empty or len(candle_df) < 19 + lookback:  # SMA_20 needs 19 rows of warm-up
             self.logger.warning("Not enough candle data to make a decision.")
             return
 
@@ -42,9 +129,14 @@ class TradingLogic:
             self.logger.warning("Could not calculate indicators. Skipping cycle.")
             return
 
-        # 2. Make Prediction:  Use the latest data point to predict
-        last_data = candle_df.iloc[[-1]][['close','SMA_20','RSI']].values  # Get the latest row, select features
-        prediction = self.neural_network.predict(last_data.reshape((1,1,3)))  # Reshape for single prediction
+        # 2. Make Prediction:  Use the latest data points to predict
+        last_data = candle_df[['close','SMA_20','RSI']].values[-lookback:]  # Get the latest rows, select features
+        start = time.perf_counter()
+        # Inference runs in a worker thread so ticks keep flowing while the model(s) evaluate
+        prediction = await asyncio.to_thread(
+            self.neural_network.predict, last_data.reshape((1, lookback, 3))  # Reshape for single prediction
+        )
+        self.observe("deriv_prediction_latency_seconds", start)
 
         if prediction is None:
             self.logger.warning("Prediction failed. Skipping cycle.")
@@ -60,24 +152,24 @@ class TradingLogic:
             return
 
         self.logger.info(f"Prediction: {prediction:.2f}, Trade Direction: {trade_direction}")
-        if trade_direction == "rise" and self.config["contract_type"]=="rise_fall":
-            contract_type = "rise"
-        elif trade_direction == "fall" and self.config["contract_type"]=="rise_fall":
-            contract_type = "fall"
-        elif trade_direction == "rise" and self.config["contract_type"]=="up_down":
-          contract_type = "up"
-        elif trade_direction == "fall" and self.config["contract_type"]=="up_down":
-          contract_type = "down"
+        start = time.perf_counter()
+        if self.proposal_durations:
+            buy_result = await self.buy_best_variant(trade_direction)
         else:
-            self.logger.warning("Not Allowed Contract Type")
-            return
-
-        buy_result = await self.api_client.buy_contract(
-            self.config["symbol"],
-            contract_type,
-            self.config["amount"],
-            self.config["duration"]
-        )
+            contract_type = self.contract_type_for(trade_direction, self.config["contract_type"])
+            if contract_type is None or self.config["contract_type"] == "higher_lower":  # buy_contract sends no barrier
+                self.logger.warning("Not Allowed Contract Type")
+                return
+
+            buy_result = await self.api_client.buy_contract(
+                self.config["symbol"],
+                contract_type,
+                self.config["amount"],
+                self.config["duration"],
+                duration_unit=self.config.get("duration_unit") or "m",
+            )
+
+        self.observe("deriv_order_latency_seconds", start)
 
         if buy_result:
             self.logger.info(f"Trade executed successfully: {buy_result}")
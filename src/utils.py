@@ -47,12 +47,24 @@ def load_env_vars():
     load_dotenv()  # Carga las variables desde .env
     return {
         "deriv_token": os.getenv("DERIV_TOKEN"),
+        "api_id": os.getenv("API_ID"),  # Deriv app_id registered for this application
         "account_type": os.getenv("ACCOUNT_TYPE"),
         "symbol": os.getenv("SYMBOL"),
         "candle_interval": os.getenv("CANDLE_INTERVAL"),
         "contract_type": os.getenv("CONTRACT_TYPE"),
         "amount": os.getenv("AMOUNT"),
-        "duration": os.getenv("DURATION")
+        "duration": os.getenv("DURATION"),
+        "tick_interval": os.getenv("TICK_INTERVAL"),  # Expected seconds between ticks; enables tick gap detection
+        "proposal_durations": os.getenv("PROPOSAL_DURATIONS"),  # e.g. "1,3,5"; enables the proposal fan-out
+        "proposal_contract_types": os.getenv("PROPOSAL_CONTRACT_TYPES"),  # e.g. "rise_fall,higher_lower"
+        "duration_unit": os.getenv("DURATION_UNIT", "m"),
+        "barrier": os.getenv("BARRIER"),
+        "min_payout_ratio": os.getenv("MIN_PAYOUT_RATIO", "0"),
+        "proposal_timeout": os.getenv("PROPOSAL_TIMEOUT", "2"),
+        "inference_backend": os.getenv("INFERENCE_BACKEND", "keras"),  # keras | tflite
+        "tflite_quantization": os.getenv("TFLITE_QUANTIZATION", "none"),  # none | float16 | int8
+        "ensemble_models": os.getenv("ENSEMBLE_MODELS"),  # e.g. "models/a.h5,models/b.h5"; Keras backend only
+        "ensemble_method": os.getenv("ENSEMBLE_METHOD", "mean")  # mean | vote
     }
 
 def encrypt_token(token, key="my_secret_key"):